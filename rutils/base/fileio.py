@@ -1,15 +1,34 @@
+import errno
 import hashlib
+import io
 import json
+import mmap
 import os
 import pickle
+import struct
+from concurrent.futures import ThreadPoolExecutor
 
 import msgpack
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+MMAP_THRESHOLD = 4 << 20  # memory-map files larger than 4 MiB instead of reading them
+
+_BLOCK_SIZE = 4096  # O_DIRECT alignment of memory, offsets and lengths
+_SIZE = struct.Struct('<Q')  # length prefix used by pickle_dump_oob()
+_OOB_MAGIC = b'RUTILOOB'  # header of pickle_dump_oob() files
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
 
 def make_parent_dir(path):
     parent_dir = os.path.dirname(os.path.abspath(os.path.normpath(path)))
-    os.makedirs(parent_dir, exist_ok=True)
+    if not os.path.isdir(parent_dir):  # one stat, cheaper than makedirs() in bulk-write loops
+        os.makedirs(parent_dir, exist_ok=True)
 
 
 def write(out, filename):
@@ -19,18 +38,60 @@ def write(out, filename):
         f.write(out)
 
 
-def json_load(filename):
+def json_load(filename, fast=False):
+    """
+    Load JSON file.
+
+    With ``fast``, orjson is used when it is installed. It reads integers wider than 64 bits
+    as floats, losing precision, while the stdlib keeps them exact.
+    """
+    if fast and orjson is not None:
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:  # e.g. NaN/Infinity literals, which only stdlib json accepts
+            pass
     with open(filename) as f:
         data = json.load(f)
     return data
 
 
-def json_dump(data, filename, **kw):
+def json_dump(data, filename, fast=False, **kw):
+    """
+    Dump data as JSON.
+
+    With ``fast``, orjson is used when it is installed and ``kw`` is limited to ``indent=2`` and ``sort_keys``.
+    Its output differs from the stdlib's: separators are compact (``{"a":1}``), non-ASCII is written as
+    raw UTF-8 instead of ``\\u`` escapes, and NaN/Infinity are written as ``null``.
+    """
     make_parent_dir(filename)
+    option = _orjson_option(kw) if fast else None
+    if option is not None:
+        try:
+            out = orjson.dumps(data, option=option)
+        except orjson.JSONEncodeError:  # e.g. integers beyond 64 bits
+            pass
+        else:
+            with open(filename, 'wb') as f:
+                f.write(out)
+            return
     with open(filename, 'w') as f:
         json.dump(data, f, **kw)
 
 
+def _orjson_option(kw):
+    """Translate ``json.dump()`` keyword arguments into orjson options, or None if orjson cannot honor them."""
+    if orjson is None or not set(kw) <= {'indent', 'sort_keys'} or kw.get('indent') not in (None, 2):
+        return None
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if kw.get('indent') == 2:
+        option |= orjson.OPT_INDENT_2
+    if kw.get('sort_keys'):
+        option |= orjson.OPT_SORT_KEYS
+    return option
+
+
 def read_tsv(filename, **kw):
     _kw = dict(sep='\t', header=0)
     _kw.update(kw)
@@ -38,6 +99,24 @@ def read_tsv(filename, **kw):
     return df
 
 
+def read_tsv_fast(filename, arrow_dtypes=True):
+    """
+    Read TSV file with the multi-threaded pyarrow parser.
+    Column types follow pyarrow's inference (e.g. ISO dates, null tokens) rather than pandas'.
+    With ``arrow_dtypes``, columns keep Arrow-backed dtypes instead of being converted to numpy/object.
+    """
+    try:
+        import pyarrow.csv as pa_csv
+    except ImportError as e:
+        raise ImportError('read_tsv_fast() requires pyarrow') from e
+    table = pa_csv.read_csv(
+        filename,
+        read_options=pa_csv.ReadOptions(block_size=8 << 20),
+        parse_options=pa_csv.ParseOptions(delimiter='\t'),
+    )
+    return table.to_pandas(types_mapper=pd.ArrowDtype if arrow_dtypes else None)
+
+
 def to_tsv(df, filename, **kw):
     make_parent_dir(filename)
     _kw = dict(sep='\t', index=False)
@@ -45,34 +124,249 @@ def to_tsv(df, filename, **kw):
     df.to_csv(filename, **_kw)
 
 
+def read_feather(filename, **kw):
+    return pd.read_feather(filename, **kw)
+
+
+def to_feather(df, filename, **kw):
+    """Write DataFrame in Feather format, suited for hot intermediate data (uncompressed or lz4)."""
+    make_parent_dir(filename)
+    _kw = dict(compression='lz4')
+    _kw.update(kw)
+    df.to_feather(filename, **_kw)
+
+
+def read_parquet(filename, **kw):
+    return pd.read_parquet(filename, **kw)
+
+
+def to_parquet(df, filename, **kw):
+    """Write DataFrame in Parquet format, suited for archived data (zstd-compressed)."""
+    make_parent_dir(filename)
+    _kw = dict(compression='zstd', index=False)
+    _kw.update(kw)
+    df.to_parquet(filename, **_kw)
+
+
 def pickle_load(filename):
-    """Load pickled object"""
+    """Load pickled object (zstd-compressed files are detected automatically)"""
     with open(filename, 'rb') as f:
+        if f.peek(len(_ZSTD_MAGIC))[:len(_ZSTD_MAGIC)] == _ZSTD_MAGIC:
+            import zstandard
+            with zstandard.ZstdDecompressor().stream_reader(f) as r:
+                return pickle.load(io.BufferedReader(r, CHUNK_SIZE))
+        if f.peek(len(_OOB_MAGIC))[:len(_OOB_MAGIC)] == _OOB_MAGIC:
+            raise ValueError(f'{filename} was written by pickle_dump_oob(); load it with pickle_load_oob()')
+        if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return pickle.loads(mm)
         obj = pickle.load(f)
     return obj
 
 
-def pickle_dump(obj, filename, **kw):
-    """Dump pickled object"""
+def pickle_dump(obj, filename, protocol=pickle.HIGHEST_PROTOCOL, compress=False, **kw):
+    """Dump pickled object. With ``compress``, the stream is zstd-compressed (requires ``zstandard``)."""
+    make_parent_dir(filename)
+    with open(filename, 'wb') as f:
+        if compress:
+            import zstandard
+            cctx = zstandard.ZstdCompressor(level=3, threads=-1)
+            with cctx.stream_writer(f, closefd=False) as w:
+                pickle.dump(obj, w, protocol=protocol, **kw)
+        else:
+            pickle.dump(obj, f, protocol=protocol, **kw)
+
+
+def pickle_dump_direct(obj, filename, protocol=pickle.HIGHEST_PROTOCOL):
+    """
+    Dump pickled object with ``O_DIRECT``, bypassing the page cache.
+    Meant for large objects written once and read elsewhere. The pickle is
+    streamed through one ``CHUNK_SIZE`` aligned buffer, so memory use stays
+    bounded. Falls back to buffered writes where direct I/O is unsupported.
+    Do not add an explicit flush/fsync here; it only stalls the writer.
+    """
+    if not hasattr(os, 'O_DIRECT'):
+        return pickle_dump(obj, filename, protocol=protocol)
+    make_parent_dir(filename)
+    try:
+        writer = _DirectWriter(filename)
+    except OSError:  # e.g. tmpfs rejects O_DIRECT
+        return pickle_dump(obj, filename, protocol=protocol)
+    with writer:
+        pickle.dump(obj, writer, protocol=protocol)
+
+
+class _DirectWriter:
+    """
+    Write-only file object that writes block-aligned chunks to an ``O_DIRECT`` descriptor.
+    If the filesystem rejects the direct I/O itself, it continues with a buffered file from the same offset.
+    """
+
+    def __init__(self, filename):
+        self._buf = mmap.mmap(-1, CHUNK_SIZE)  # anonymous mmap is page-aligned
+        try:
+            self._fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o666)
+        except OSError:
+            self._buf.close()
+            raise
+        self._filename = filename
+        self._file = None  # buffered file, once fallen back
+        self._pos = 0  # bytes pending in the buffer
+        self._offset = 0  # bytes already written to the file
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, data):
+        with memoryview(data) as raw, raw.cast('B') as view:
+            n = len(view)
+            done = 0
+            while done < n and self._file is None:
+                k = min(n - done, CHUNK_SIZE - self._pos)
+                self._buf[self._pos:self._pos + k] = view[done:done + k]
+                self._pos += k
+                done += k
+                if self._pos == CHUNK_SIZE:
+                    self._flush(CHUNK_SIZE)
+            if done < n:
+                self._file.write(view[done:])
+        return n
+
+    def _flush(self, length):
+        """Write the first ``length`` bytes of the buffer, which must be a multiple of ``_BLOCK_SIZE``."""
+        view = memoryview(self._buf)
+        try:
+            written = 0
+            while written < length:
+                try:
+                    written += os.pwrite(self._fd, view[written:length], self._offset + written)
+                except OSError as e:
+                    # Raised by filesystems that accept O_DIRECT but not the I/O, or after a short unaligned write
+                    if e.errno != errno.EINVAL:
+                        raise
+                    os.close(self._fd)
+                    self._fd = None
+                    self._file = open(self._filename, 'r+b')
+                    self._file.seek(self._offset + written)
+                    self._file.write(view[written:length])
+                    break
+        finally:
+            view.release()
+        self._offset += length
+        self._pos = 0
+
+    def close(self):
+        try:
+            if self._file is None:  # otherwise the buffered file already ends at the right size
+                size = self._offset + self._pos
+                if self._pos:
+                    self._flush(-(-self._pos // _BLOCK_SIZE) * _BLOCK_SIZE)  # pad, then cut back to size
+                if self._file is None:
+                    os.ftruncate(self._fd, size)
+                else:
+                    self._file.truncate(size)
+        finally:
+            if self._file is None:
+                os.close(self._fd)
+            else:
+                self._file.close()
+            self._buf.close()
+
+
+def pickle_load_oob(filename):
+    """Load object dumped by ``pickle_dump_oob()``"""
+    with open(filename, 'rb') as f:
+        if f.read(len(_OOB_MAGIC)) != _OOB_MAGIC:
+            raise ValueError(f'{filename} was not written by pickle_dump_oob()')
+        data = _read_sized(f)
+        buffers = [_read_sized(f) for _ in range(_read_size(f))]
+    return pickle.loads(data, buffers=buffers)
+
+
+def pickle_dump_oob(obj, filename):
+    """
+    Dump pickled object with its large buffers (e.g. numpy arrays) stored out-of-band.
+    This avoids copying the buffers into the pickle stream. Load with ``pickle_load_oob()``.
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
     make_parent_dir(filename)
     with open(filename, 'wb') as f:
-        pickle.dump(obj, f, **kw)
+        f.write(_OOB_MAGIC)
+        _write_sized(f, data)
+        f.write(_SIZE.pack(len(buffers)))
+        for buf in buffers:
+            _write_sized(f, buf.raw())
+
+
+def _read_size(f):
+    return _SIZE.unpack(_read_exact(f, _SIZE.size))[0]
+
+
+def _read_sized(f):
+    return _read_exact(f, _read_size(f))
+
+
+def _read_exact(f, n):
+    """Read exactly ``n`` bytes into a writable bytearray, so unpickled arrays stay writable."""
+    buf = bytearray(n)
+    got = f.readinto(buf)
+    if got != n:
+        raise EOFError(f'{f.name} is truncated: expected {n} bytes, got {got}')
+    return buf
+
+
+def _write_sized(f, data):
+    f.write(_SIZE.pack(len(data)))
+    f.write(data)
 
 
 def pack_msgpack(o, filename):
     make_parent_dir(filename)
     with open(filename, 'wb') as f:
-        msgpack.pack(o, f)
+        f.write(msgpack.packb(o, use_bin_type=True))
 
 
-def unpack_msgpack(filename):
+def unpack_msgpack(filename, **kw):
+    """Unpack msgpack file. Pass ``use_list=False`` to get tuples, which are cheaper to allocate."""
+    _kw = dict(raw=False, strict_map_key=False)
+    _kw.update(kw)
     with open(filename, 'rb') as f:
-        return msgpack.unpack(f)
+        return msgpack.unpackb(f.read(), **_kw)
+
+
+def file_hash(filename, algo='sha256'):
+    """Return the hex digest of a file, using any algorithm known to hashlib."""
+    h = hashlib.new(algo)
+    if os.path.getsize(filename) > MMAP_THRESHOLD:
+        with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            h.update(mm)
+        return h.hexdigest()
+    buf = bytearray(CHUNK_SIZE)
+    view = memoryview(buf)
+    with open(filename, 'rb', buffering=0) as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
+    return h.hexdigest()
 
 
 def md5(filename):
-    hash_md5 = hashlib.md5()
-    with open(filename, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b''):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+    return file_hash(filename, algo='md5')
+
+
+def file_hash_many(filenames, algo='sha256', workers=os.cpu_count()):
+    """
+    Return the hex digests of many files, hashed concurrently.
+
+    hashlib releases the GIL while hashing, so plain threads scale with cores.
+    Each worker holds one ``CHUNK_SIZE`` (1 MiB) read buffer.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda fn: file_hash(fn, algo=algo), filenames))
+
+
+def md5_many(filenames, workers=os.cpu_count()):
+    return file_hash_many(filenames, algo='md5', workers=workers)
@@ -1,14 +1,27 @@
+import functools
+import os
+
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.font_manager import findSystemFonts, fontManager
 
 from rutils.base.fileio import make_parent_dir
 from rutils.base.stats import neglog10
 
+_neglog10 = functools.lru_cache(maxsize=32)(neglog10)
+
 
 def update_mpl_style(fontpaths='fonts'):
 
-    for fontfile in findSystemFonts(fontpaths=fontpaths):
-        fontManager.addfont(fontfile)
+    registered = {font.fname for font in fontManager.ttflist + fontManager.afmlist}
+    if isinstance(fontpaths, str):
+        fontpaths = [fontpaths]
+    if fontpaths is not None:  # None scans the system font directories
+        # Absolute paths keep the cache valid across chdir(), and a tuple is hashable
+        fontpaths = tuple(os.path.abspath(path) for path in fontpaths)
+    for fontfile in _find_fonts(fontpaths):
+        if fontfile not in registered:
+            fontManager.addfont(fontfile)
 
     # Update matplotlib rcParams
     plt.rcParams.update({
@@ -37,6 +50,11 @@ def update_mpl_style(fontpaths='fonts'):
     })
 
 
+@functools.lru_cache(maxsize=None)
+def _find_fonts(fontpaths):
+    return tuple(findSystemFonts(fontpaths=fontpaths))
+
+
 def ax_axhlines_alpha(a=0.05, ax=None, **kwargs):
     """
     Draw horizontal lines of the significance level, alpha.
@@ -66,9 +84,8 @@ def ax_axhlines_alpha(a=0.05, ax=None, **kwargs):
     .. image:: _static/axhlines_alpha.png
     """
     if ax is None:
-        import matplotlib.pyplot as plt
         ax = plt.gca()
-    log10a = neglog10(a)
+    log10a = _neglog10(a)
     pos, neg = (log10a, -log10a)
     ax.axhline(y=pos, **kwargs)
     ax.axhline(y=neg, **kwargs)
@@ -119,7 +136,6 @@ def autotext(x, y, s, ax=None, **kwargs):
     .. image:: _static/autotext.png
     """
     if ax is None:
-        import matplotlib.pyplot as plt
         ax = plt.gca()
     ha = 'center' if x == 0.5 else ('left' if x < 0.5 else 'right')
     va = 'center' if y == 0.5 else ('bottom' if y < 0.5 else 'top')
@@ -177,7 +193,6 @@ def autolabel(rects, xpos='center', formatstr='{}', ax=None, ylim=None, **kwargs
     offset = {'center': 0.5, 'right': 0.57, 'left': 0.43}  # x_txt = x + w*off
 
     if ax is None:
-        import matplotlib.pyplot as plt
         ax = plt.gca()
 
     for rect in rects:
@@ -215,18 +230,23 @@ def set_sharey_symm(axs):
     """
     Make y-axes symmetrical.
     """
-    yabsmax = 0
-    for ax in axs:
-        yb, yt = ax.get_ylim()
-        yabsmax = max(abs(yb), abs(yt), yabsmax)
+    axs = np.ravel(axs)
+    yabsmax = np.abs([ax.get_ylim() for ax in axs]).max(initial=0)
     for ax in axs:
         ax.set_ylim(-yabsmax, yabsmax)
 
 
-def savefig(filename, **kwargs):
+def savefig(filename, fig=None, **kwargs):
+    """
+    Save and close the figure. (Current figure)
+    Passing ``fig`` avoids pyplot global state, so figures built directly with
+    ``matplotlib.figure.Figure`` can be rendered and saved from worker threads.
+    """
+    if fig is None:
+        fig = plt.gcf()
     make_parent_dir(filename)
     tight_layout = kwargs.pop('tight_layout', False)
     if tight_layout:
-        plt.tight_layout()
-    plt.savefig(filename, **kwargs)
-    plt.close()
+        fig.tight_layout()
+    fig.savefig(filename, **kwargs)
+    plt.close(fig)